@@ -16,10 +16,50 @@ It does support nested serializers.
 """
 
 import decimal
-from datetime import datetime
+import operator
+import re
+import sys
+from datetime import date, datetime
 
 from isodate import date_isoformat, datetime_isoformat, parse_date, parse_datetime
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    # Python 2
+    from collections import Mapping
+
+try:
+    from sys import intern
+except ImportError:
+    # Built-in on Python 2
+    pass
+
+if sys.version_info >= (3, 11):
+    # Native parsers accept most of ISO 8601 since Python 3.11 and are much
+    # faster, isodate still handles the remaining formats and time zones
+
+    def _parse_date(json_value):
+        try:
+            return date.fromisoformat(json_value)
+        except ValueError:
+            # Reduced precision and other formats not supported natively
+            return parse_date(json_value)
+
+    # Native parser reads decimal hours and minutes as seconds, and time
+    # zones from isodate are formatted back the same way (e.g. 'Z')
+    _native_datetime = re.compile(
+        r'[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}(\.[0-9]{3}|\.[0-9]{6})?$')
+
+    def _parse_datetime(json_value):
+        if _native_datetime.match(json_value):
+            return datetime.fromisoformat(json_value)
+        else:
+            return parse_datetime(json_value)
+else:
+    _parse_date = parse_date
+    _parse_datetime = parse_datetime
+
 
 class SerializationError(Exception):
     pass
@@ -28,6 +68,8 @@ class SerializationError(Exception):
 class Converter(object):
     """Abstract converter between Python and JSON basic types."""
 
+    __slots__ = ('__weakref__',)
+
     def model_to_json(self, model_value):
         raise NotImplementedError('To be implemented in subclasses')
 
@@ -38,10 +80,18 @@ class Converter(object):
 class String(Converter):
     """String conversion."""
 
+    __slots__ = ('allow_empty',)
+
     def __init__(self, allow_empty=False):
         super(String, self).__init__()
         self.allow_empty = allow_empty
 
+    def __getstate__(self):
+        return (self.allow_empty,)
+
+    def __setstate__(self, state):
+        String.__init__(self, *state)
+
     def model_to_json(self, model_value):
         # Same type in Python and JSON
         return str(model_value)
@@ -59,6 +109,8 @@ class String(Converter):
 class Boolean(Converter):
     """Boolean conversion."""
 
+    __slots__ = ()
+
     def model_to_json(self, model_value):
         # Same type in Python and JSON
         return bool(model_value)
@@ -71,6 +123,8 @@ class Boolean(Converter):
 class Integer(Converter):
     """Integer conversion."""
 
+    __slots__ = ()
+
     def model_to_json(self, model_value):
         # Number in JSON
         return int(model_value)
@@ -86,6 +140,8 @@ class Integer(Converter):
 class Decimal(Converter):
     """Fixed point decimal conversion."""
 
+    __slots__ = ()
+
     def model_to_json(self, model_value):
         # Number in JSON
         return float(model_value)
@@ -101,6 +157,8 @@ class Decimal(Converter):
 class Date(Converter):
     """Date conversion."""
 
+    __slots__ = ()
+
     def model_to_json(self, model_value):
         # RFC 3339 string in JSON
         return date_isoformat(model_value)
@@ -108,14 +166,16 @@ class Date(Converter):
     def json_to_model(self, json_value):
         # datetime.date in Python
         try:
-            return parse_date(json_value)
-        except ValueError as e:
+            return _parse_date(json_value)
+        except (ValueError, TypeError) as e:
             raise SerializationError(e)
 
 
 class DateTime(Converter):
     """Date and time conversion."""
 
+    __slots__ = ()
+
     def model_to_json(self, model_value):
         # RFC 3339 string in JSON
         return datetime_isoformat(model_value)
@@ -123,22 +183,50 @@ class DateTime(Converter):
     def json_to_model(self, json_value):
         # datetime.datetime in Python
         try:
-            return parse_datetime(json_value)
-        except ValueError as e:
+            if 'T' not in json_value:
+                # Native parser would accept a date alone
+                raise ValueError("Time is missing in '%s'" % json_value)
+            return _parse_datetime(json_value)
+        except (ValueError, TypeError) as e:
             raise SerializationError(e)
 
 
+# Builtins equivalent to the conversion methods of basic converters, called
+# directly by fields and arrays when the converter is not subclassed
+_builtin_to_json = {String: str, Boolean: bool, Integer: int, Decimal: float}
+_builtin_to_model = {Boolean: bool}
+
+
+def _bind_converter(converter):
+    """Return bound (model_to_json, json_to_model) of a converter."""
+    converter_type = type(converter)
+    return (_builtin_to_json.get(converter_type, converter.model_to_json),
+            _builtin_to_model.get(converter_type, converter.json_to_model))
+
+
 class Array(Converter):
     """Array conversion (immutable lists like Python tuples)."""
 
+    __slots__ = ('converter', '_to_json', '_to_model')
+
     def __init__(self, converter):
         # Support types from classes, instances, and callables
         if not isinstance(converter, Converter):
             converter = converter()
         self.converter = converter
 
+        # Bound methods save attribute lookups per element
+        self._to_json, self._to_model = _bind_converter(converter)
+
+    def __getstate__(self):
+        # Bound methods are rebuilt from the converter
+        return (self.converter,)
+
+    def __setstate__(self, state):
+        Array.__init__(self, *state)
+
     def model_to_json(self, model_values):
-        return [self.converter.model_to_json(value) for value in model_values]
+        return list(map(self._to_json, model_values))
 
     def json_to_model(self, json_values):
         if isinstance(json_values, str):
@@ -146,7 +234,7 @@ class Array(Converter):
             raise SerializationError('String cannot be converted to an array')
 
         try:
-            return [self.converter.json_to_model(value) for value in json_values]
+            return list(map(self._to_model, json_values))
         except TypeError as e:
             raise SerializationError(e)
 
@@ -154,6 +242,8 @@ class Array(Converter):
 class AbstractSerializer(object):
     """Abstract JSON serialization class."""
 
+    __slots__ = ('__weakref__',)
+
     def serialize(self, model):
         raise NotImplementedError('To be implemented in subclasses')
 
@@ -161,14 +251,18 @@ class AbstractSerializer(object):
         raise NotImplementedError('To be implemented in subclasses')
 
     def serialize_all(self, models):
-        return [self.serialize(model) for model in models]
+        return list(map(self.serialize, models))
 
 
 class Field(AbstractSerializer):
     """Serializes a model attribute using one of the basic types."""
 
+    __slots__ = ('model_attr', '_get', 'readonly', 'createonly', 'nullable',
+                 'converter', '_to_json', '_to_model')
+
     def __init__(self, model_attr, converter, readonly=False, createonly=False, nullable=True):
         self.model_attr = model_attr
+        self._get = operator.attrgetter(model_attr)
         self.readonly = readonly
         self.createonly = createonly
         self.nullable = nullable
@@ -178,26 +272,34 @@ class Field(AbstractSerializer):
             converter = converter()
         self.converter = converter
 
+        # Bound methods save attribute lookups per value
+        self._to_json, self._to_model = _bind_converter(converter)
+
+    def __getstate__(self):
+        # Getter and bound methods are rebuilt from the constructor arguments
+        return (self.model_attr, self.converter, self.readonly, self.createonly, self.nullable)
+
+    def __setstate__(self, state):
+        Field.__init__(self, *state)
+
     def serialize(self, model):
-        model_value = getattr(model, self.model_attr)
-        if model_value is not None:
-            return self.converter.model_to_json(model_value)
-        else:
-            return None
+        model_value = self._get(model)
+        return self._to_json(model_value) if model_value is not None else None
 
     def deserialize(self, model, json_value, create=False):
-        # Also makes sure that the attribute exists (raises otherwise)
-        old_json_value = self.serialize(model)
+        # Makes sure that the attribute exists (raises otherwise)
+        self._get(model)
 
         if self.readonly or (self.createonly and not create):
-            # Compare new value with serialized old value
-            if json_value != old_json_value:
+            # Compare new value with serialized old value, the conversion
+            # is only needed here
+            if json_value != self.serialize(model):
                 raise SerializationError(
                     "Cannot change read-only attribute '%s'" % self.model_attr)
         else:
             model_value = None
             if json_value is not None:
-                model_value = self.converter.json_to_model(json_value)
+                model_value = self._to_model(json_value)
 
             if model_value is None and not self.nullable:
                 raise SerializationError(
@@ -209,8 +311,11 @@ class Field(AbstractSerializer):
 class MapField(AbstractSerializer):
     """Serializes a model attribute as a nested object."""
 
+    __slots__ = ('model_attr', '_get', 'nullable', 'mapping', '_ser', '_deser')
+
     def __init__(self, model_attr, mapping, nullable=False):
         self.model_attr = model_attr
+        self._get = operator.attrgetter(model_attr)
         self.nullable = nullable
 
         # Covert unknown mappings to Serializers
@@ -218,19 +323,27 @@ class MapField(AbstractSerializer):
             mapping = Serializer(mapping)
         self.mapping = mapping
 
+        # Bound methods save attribute lookups per value
+        self._ser = mapping.serialize
+        self._deser = mapping.deserialize
+
+    def __getstate__(self):
+        # Getter and bound methods are rebuilt from the constructor arguments
+        return (self.model_attr, self.mapping, self.nullable)
+
+    def __setstate__(self, state):
+        MapField.__init__(self, *state)
+
     def serialize(self, model):
-        model_value = getattr(model, self.model_attr)
-        if model_value is not None:
-            return self.mapping.serialize(model_value)
-        else:
-            return None
+        model_value = self._get(model)
+        return self._ser(model_value) if model_value is not None else None
 
     def deserialize(self, model, json_value, create=False):
-        model_value = getattr(model, self.model_attr)
+        model_value = self._get(model)
 
         if json_value is not None:
             if model_value is not None:
-                self.mapping.deserialize(model_value, json_value, create)
+                self._deser(model_value, json_value, create)
             else:
                 raise SerializationError(
                     "Cannot modify a null nested field '%s'" % self.model_attr)
@@ -245,9 +358,17 @@ class MapField(AbstractSerializer):
 class Callable(AbstractSerializer):
     """Generic serialization field based on any callable."""
 
+    __slots__ = ('callable',)
+
     def __init__(self, callable):
         self.callable = callable
 
+    def __getstate__(self):
+        return (self.callable,)
+
+    def __setstate__(self, state):
+        Callable.__init__(self, *state)
+
     def serialize(self, model):
         return self.callable(model)
 
@@ -257,47 +378,128 @@ class Callable(AbstractSerializer):
 
 
 class Serializer(AbstractSerializer):
-    """Root serialization mapping."""
+    """Root serialization mapping.
 
-    def __init__(self, mapping):
-        self.mapping = mapping
+    The mapping is compiled on construction and kept private, so a Serializer
+    cannot be modified once built; create a new one instead.
+    """
 
-    def serialize(self, model):
-        return self._serialize_nested(model, self.mapping)
-
-    def _serialize_nested(self, model, mapping):
-        json_obj = {}
-        for key in mapping:
-            if isinstance(mapping[key], AbstractSerializer):
-                # Fields handle their own serialization
-                json_obj[key] = mapping[key].serialize(model)
-            elif isinstance(mapping[key], dict):
-                # Dicts are recursive
-                json_obj[key] = self._serialize_nested(model, mapping[key])
+    __slots__ = ('_mapping', '_compiled', '_serialize_fn')
+
+    # Kinds of compiled mapping entries
+    FIELD = 0
+    NESTED = 1
+
+    def __init__(self, mapping):
+        self._mapping = mapping
+        self._compiled = self._compile(mapping)
+        self._serialize_fn = self._generate_serialize(self._compiled)
+
+    def __getstate__(self):
+        # Generated code cannot be pickled, it is rebuilt from the mapping
+        return (self._mapping,)
+
+    def __setstate__(self, state):
+        Serializer.__init__(self, *state)
+
+    def _compile(self, mapping):
+        # Flatten the mapping into (key, kind, node) records once, so that
+        # type checks are not repeated on every (de)serialization; allowed
+        # keys are kept alongside for validation of incoming objects
+        records = []
+        for key, node in mapping.items():
+            if type(key) is str:
+                # Interned keys can be matched by identity in dict lookups
+                key = intern(key)
+
+            if isinstance(node, AbstractSerializer):
+                records.append((key, self.FIELD, node))
+            elif isinstance(node, dict):
+                records.append((key, self.NESTED, self._compile(node)))
             else:
                 raise TypeError("Invalid field '%s'" % key)
 
-        return json_obj
+        return tuple(records), frozenset(key for key, _, _ in records)
+
+    def _generate_serialize(self, compiled):
+        # Generate a function computing the values in mapping order and
+        # returning the whole JSON object as nested dict literals, with
+        # getters and converters of plain and map fields inlined and any
+        # other serializers called directly
+        namespace = {}
+        statements = []
+
+        def bind(prefix, value):
+            name = '%s%d' % (prefix, len(namespace))
+            namespace[name] = value
+            return name
+
+        def inline(get, to_json):
+            var = 'value%d' % len(statements)
+            statements.append('%s = %s(model)' % (var, bind('get', get)))
+            statements.append('%s = %s(%s) if %s is not None else None' % (
+                var, bind('to_json', to_json), var, var))
+            return var
+
+        def call(serialize):
+            var = 'value%d' % len(statements)
+            statements.append('%s = %s(model)' % (var, bind('serialize', serialize)))
+            return var
+
+        def build(compiled):
+            records, _ = compiled
+            items = []
+            for key, kind, node in records:
+                if kind == self.NESTED:
+                    value = build(node)
+                elif type(node).serialize is Field.serialize:
+                    value = inline(node._get, node._to_json)
+                elif type(node).serialize is MapField.serialize:
+                    value = inline(node._get, node._ser)
+                else:
+                    value = call(node.serialize)
+
+                # Plain string keys become constants of the generated code
+                key = repr(key) if type(key) is str else bind('key', key)
+                items.append('%s: %s' % (key, value))
+
+            return '{%s}' % ', '.join(items)
+
+        json_obj = build(compiled)
+        source = 'def serialize(model):\n'
+        source += ''.join('    %s\n' % statement for statement in statements)
+        source += '    return %s\n' % json_obj
+
+        exec(compile(source, '<serializer>', 'exec'), namespace)
+        return namespace['serialize']
+
+    def serialize(self, model):
+        return self._serialize_fn(model)
 
     def deserialize(self, model, json_value, create=False):
-        self._deserialize_nested(model, json_value, self.mapping, create)
+        self._deserialize_nested(model, json_value, self._compiled, create)
 
-    def _deserialize_nested(self, model, json_obj, mapping, create):
-        unknown_keys = set(json_obj.keys()) - set(mapping.keys())
-        if unknown_keys:
+    def _deserialize_nested(self, model, json_obj, compiled, create):
+        records, allowed_keys = compiled
+
+        if not isinstance(json_obj, Mapping):
+            raise SerializationError(
+                "Expected an object but got '%s'" % type(json_obj).__name__)
+
+        # Membership test in C, the difference is only built on error
+        if not allowed_keys.issuperset(json_obj):
+            unknown_keys = [key for key in json_obj if key not in allowed_keys]
             raise SerializationError(
                 "Properties '%s' are not valid for this resource" % ', '.join(unknown_keys))
 
-        for key in mapping:
+        for key, kind, node in records:
             if key not in json_obj:
                 # Ignore missing keys for partial update
                 continue
 
-            if isinstance(mapping[key], AbstractSerializer):
+            if kind == self.FIELD:
                 # Fields handle their own deserialization
-                mapping[key].deserialize(model, json_obj[key], create=create)
-            elif isinstance(mapping[key], dict):
-                # Dicts are recursive
-                self._deserialize_nested(model, json_obj[key], mapping[key], create)
+                node.deserialize(model, json_obj[key], create=create)
             else:
-                raise TypeError("Invalid field for '%s'" % key)
+                # Dicts are recursive
+                self._deserialize_nested(model, json_obj[key], node, create)
@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*
 """Serialization tests."""
 
-from datetime import date, datetime
+import pickle
+import weakref
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    # Python 2
+    from collections import Mapping
+
 import pytest
 
 from prismatic import serialization as s
@@ -99,12 +107,133 @@ def test_serialize_all_should_handle_people():
     assert serialized_people[2]['email'] == 'test3@squirrel.me'
 
 
-def test_serialize_should_raise_on_invalid_fields():
-    invalid_serializer = s.Serializer({'firstName': 'bar'})
-    person = create_test_person()
+def test_serializer_should_raise_on_invalid_fields():
+    with pytest.raises(TypeError):
+        s.Serializer({'firstName': 'bar'})
 
     with pytest.raises(TypeError):
-        invalid_serializer.serialize(person)
+        s.Serializer({'address': {'city': 'bar'}})
+
+
+def test_serialize_should_use_overridden_field_serialization():
+    class UpperField(s.Field):
+        def serialize(self, model):
+            return super(UpperField, self).serialize(model).upper()
+
+    serializer = s.Serializer({
+        'name': UpperField('first_name', s.String),
+        'nested': {'surname': UpperField('last_name', s.String)},
+    })
+
+    assert serializer.serialize(create_test_person()) == {
+        'name': 'EMANUEL',
+        'nested': {'surname': 'ANDJELIC'},
+    }
+
+
+def test_serialize_should_use_overridden_serializer_serialization():
+    class ExtraSerializer(s.Serializer):
+        def serialize(self, model):
+            json_obj = super(ExtraSerializer, self).serialize(model)
+            json_obj['extra'] = 1
+            return json_obj
+
+    serializer = ExtraSerializer({'name': s.Field('first_name', s.String)})
+
+    assert serializer.serialize(create_test_person()) == {'name': 'Emanuel', 'extra': 1}
+
+
+def test_serialize_should_follow_mapping_order():
+    calls = []
+
+    def record(name):
+        def serialize(model):
+            calls.append(name)
+            return name
+        return serialize
+
+    class RecordingPoint(object):
+        @property
+        def x(self):
+            calls.append('x')
+            return 1
+
+    serializer = s.Serializer({
+        'c': s.Callable(record('c')),
+        'x': s.Field('x', s.Integer),
+        'nested': {'d': s.Callable(record('d'))},
+    })
+
+    assert serializer.serialize(RecordingPoint()) == {'c': 'c', 'x': 1, 'nested': {'d': 'd'}}
+    assert calls == ['c', 'x', 'd']
+
+
+class Key(str):
+    pass
+
+
+def test_serializer_should_accept_str_subclass_keys():
+    serializer = s.Serializer({Key('name'): s.Field('first_name', s.String)})
+    person = create_test_person()
+
+    assert serializer.serialize(person) == {'name': 'Emanuel'}
+
+    serializer.deserialize(person, {'name': 'Manny'})
+    assert person.first_name == 'Manny'
+
+
+def test_serializer_should_keep_str_subclass_keys_with_custom_repr():
+    class ReprKey(str):
+        def __repr__(self):
+            # Like members of str enums
+            return '<ReprKey %s>' % str(self)
+
+    key = ReprKey('name')
+    serializer = s.Serializer({key: s.Field('first_name', s.String)})
+    json_obj = serializer.serialize(create_test_person())
+
+    assert json_obj == {'name': 'Emanuel'}
+    assert list(json_obj)[0] is key
+
+
+def test_serializer_should_be_picklable():
+    serializer = s.Serializer({
+        'name': s.Field('first_name', s.String(allow_empty=True), readonly=True),
+        'dates': s.Field('dates', s.Array(s.Date)),
+        'active': s.Callable(bool),
+        'address': s.MapField('address', address_serializer, nullable=True),
+    })
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        loaded = pickle.loads(pickle.dumps(serializer, protocol))
+
+        assert loaded.serialize(create_test_person()) == {
+            'name': 'Emanuel',
+            'dates': ['2015-03-01', '2015-03-02', '2015-03-03'],
+            'active': True,
+            'address': {'city': 'London', 'postcode': None, 'country': 'UK'},
+        }
+
+
+def test_fields_and_converters_should_support_weak_references():
+    for obj in [s.Field('x', s.Integer), s.MapField('y', {}), s.Callable(len),
+                s.Serializer({}), s.String(), s.Array(s.Integer)]:
+        assert weakref.ref(obj)() is obj
+
+
+def test_deserialize_should_use_overridden_field_serialization_for_readonly():
+    class UpperField(s.Field):
+        def serialize(self, model):
+            return super(UpperField, self).serialize(model).upper()
+
+    serializer = s.Serializer({'name': UpperField('first_name', s.String, readonly=True)})
+    person = create_test_person()
+
+    # Round trip should not change the read-only attribute
+    serializer.deserialize(person, serializer.serialize(person))
+
+    with pytest.raises(s.SerializationError):
+        serializer.deserialize(person, {'name': 'Emanuel'})
 
 
 def test_deserialize_should_handle_person():
@@ -152,12 +281,45 @@ def test_deserialize_should_raise_on_unknown_attributes():
         person_serializer.deserialize(person, {'unknownkey': 'Random value'})
 
 
-def test_deserialize_should_raise_on_invalid_fields():
-    invalid_serializer = s.Serializer({'firstName': 'bar'})
+class FrozenDict(Mapping):
+    """Read-only mapping which is not a dict."""
+
+    def __init__(self, items):
+        self._items = dict(items)
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+def test_deserialize_should_accept_any_mapping():
     person = create_test_person()
 
-    with pytest.raises(TypeError):
-        invalid_serializer.deserialize(person, {'firstName': 'Random value'})
+    person_serializer.deserialize(person, FrozenDict({
+        'name': 'Manny',
+        'transactions': FrozenDict({'quantity': 12}),
+    }))
+
+    assert person.first_name == 'Manny'
+    assert person.transactions == 12
+
+
+def test_deserialize_should_raise_on_non_object_values():
+    person = create_test_person()
+
+    with pytest.raises(s.SerializationError):
+        person_serializer.deserialize(person, ['name'])
+
+    with pytest.raises(s.SerializationError):
+        person_serializer.deserialize(person, {'transactions': 'quantity'})
+
+    with pytest.raises(s.SerializationError):
+        person_serializer.deserialize(person, {'transactions': ['quantity']})
 
 
 def test_abstract_serializer_should_be_abstract():
@@ -348,6 +510,19 @@ def test_converter_should_be_abstract():
         s.Converter().json_to_model(None)
 
 
+def test_converters_should_support_explicit_base_calls():
+    class Quoted(s.String):
+        def model_to_json(self, model_value):
+            return "'%s'" % s.String.model_to_json(self, model_value)
+
+    field = s.Field('x', Quoted)
+
+    assert field.serialize(Point(x=5, y=None)) == "'5'"
+    assert s.Integer.model_to_json(s.Integer(), 2.5) == 2
+    assert s.Decimal.model_to_json(s.Decimal(), Decimal('0.5')) == 0.5
+    assert s.Boolean.json_to_model(s.Boolean(), 1) is True
+
+
 def test_string_should_convert_to_json():
     field = s.String()
 
@@ -467,6 +642,11 @@ def test_date_should_convert_to_model():
     assert field.json_to_model('2014-12-31') == date(2014, 12, 31)
     assert field.json_to_model('2012-02-29') == date(2012, 2, 29)
 
+    # Reduced precision and ordinal dates
+    assert field.json_to_model('2014-02') == date(2014, 2, 1)
+    assert field.json_to_model('2014') == date(2014, 1, 1)
+    assert field.json_to_model('2014-059') == date(2014, 2, 28)
+
 
 def test_date_should_raise_on_invalid_input():
     field = s.Date()
@@ -481,6 +661,9 @@ def test_date_should_raise_on_invalid_input():
         # Not a leap year
         field.json_to_model('2014-02-29')
 
+    with pytest.raises(s.SerializationError):
+        field.json_to_model(20140228)
+
 
 def test_date_time_should_convert_to_json():
     field = s.DateTime()
@@ -496,6 +679,20 @@ def test_date_time_should_convert_to_model():
     assert field.json_to_model('2015-01-01T16:16:37.000001') == datetime(2015, 1, 1, 16, 16, 37, 1)
     assert field.json_to_model('2014-12-31T00:00:00') == datetime(2014, 12, 31)
     assert field.json_to_model('2012-02-29T23:59:59') == datetime(2012, 2, 29, 23, 59, 59)
+    assert field.json_to_model('2015-059T10:00') == datetime(2015, 2, 28, 10, 0)
+
+    # Decimal hours and minutes
+    assert field.json_to_model('2015-01-01T10.5') == datetime(2015, 1, 1, 10, 30)
+    assert field.json_to_model('2015-01-01T10:30.5') == datetime(2015, 1, 1, 10, 30, 30)
+
+
+def test_date_time_should_preserve_utc_designator():
+    field = s.DateTime()
+
+    for json_value in ['2015-01-01T10:00:00Z', '2015-01-01T10:00:00+00:00']:
+        model_value = field.json_to_model(json_value)
+        assert model_value.utcoffset() == timedelta(0)
+        assert field.model_to_json(model_value) == '2015-01-01T10:00:00Z'
 
 
 def test_date_time_should_raise_on_invalid_input():
@@ -512,6 +709,9 @@ def test_date_time_should_raise_on_invalid_input():
         # Use Date field instead
         field.json_to_model('2015-01-01')
 
+    with pytest.raises(s.SerializationError):
+        field.json_to_model(20150101)
+
 
 def test_array_should_convert_to_json():
     field = s.Array(s.Date())
@@ -541,6 +741,20 @@ def test_array_should_raise_on_invalid_input():
     with pytest.raises(s.SerializationError):
         field.json_to_model(123)
 
+    with pytest.raises(s.SerializationError):
+        field.json_to_model([None])
+
+
+def test_array_should_wrap_type_errors_of_custom_converters():
+    class Strict(s.Converter):
+        def json_to_model(self, json_value):
+            raise TypeError('Always invalid')
+
+    field = s.Array(Strict)
+
+    with pytest.raises(s.SerializationError):
+        field.json_to_model([1])
+
 
 def test_callable_should_serialize():
     field = s.Callable(lambda name: 'Hello, %s!' % name)